@@ -1,11 +1,22 @@
 import random
-from pysat.solvers import Glucose3
-from collections import deque
+try:
+    from pysat.solvers import Glucose4 as Glucose
+except ImportError:  # older python-sat releases
+    from pysat.solvers import Glucose3 as Glucose
+from pysat.card import CardEnc, EncType
+from collections import Counter, deque
 
 # ============================================
 # Base Agent Class and Utility Functions
 # ============================================
+# Move names, indexed by two random bits in RandomWalkAgent.
+_DIRS = ('up', 'down', 'left', 'right')
+
 class Agent:
+    # Grid offset of each move, and the move for each offset.
+    _DELTA = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+    _DIR = {delta: direction for direction, delta in _DELTA.items()}
+
     def __init__(self, world):
         self.world = world
 
@@ -14,20 +25,42 @@ class Agent:
 
     def move(self, direction):
         x, y = self.world.agent_pos
-        if direction == 'up':
-            new_pos = (x - 1, y)
-        elif direction == 'down':
-            new_pos = (x + 1, y)
-        elif direction == 'left':
-            new_pos = (x, y - 1)
-        elif direction == 'right':
-            new_pos = (x, y + 1)
-        else:
-            new_pos = (x, y)
-        self.world.move_agent(new_pos)
-
-def manhattan_distance(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        dx, dy = self._DELTA.get(direction, (0, 0))
+        self.world.move_agent((x + dx, y + dy))
+
+def bfs_parents(neighbors, passable, start, target=-1):
+    # Breadth-first search over flat cell ids using only ints and lists.
+    # A cell may be entered when passable[cell] is set; the target is always
+    # enterable. Returns the parent of every reached cell (start is its own parent, -1
+    # marks unreached) and stops as soon as the target is dequeued.
+    parents = [-1] * len(neighbors)
+    parents[start] = start
+    queue = deque([start])
+    while queue:
+        cur = queue.popleft()
+        if cur == target:
+            break
+        for n in neighbors[cur]:
+            if parents[n] == -1 and (passable[n] or n == target):
+                parents[n] = cur
+                queue.append(n)
+    return parents
+
+def bfs_parents_to_blocked(neighbors, passable, start):
+    # Like bfs_parents, but every impassable cell next to the explored region
+    # also gets a parent without being expanded. Each cell's path is then the one
+    # a bfs_parents call targeting that cell alone would find.
+    parents = [-1] * len(neighbors)
+    parents[start] = start
+    queue = deque([start])
+    while queue:
+        cur = queue.popleft()
+        for n in neighbors[cur]:
+            if parents[n] == -1:
+                parents[n] = cur
+                if passable[n]:
+                    queue.append(n)
+    return parents
 
 # ============================================
 # CNFAgent: Inference, Risk, and Path Planning
@@ -37,188 +70,184 @@ class CNFAgent(Agent):
         super().__init__(world)
         self.debug = debug
 
-        # Exploration memory
+        # Exploration memory. Cells are stored as flat ids i * world_size + j;
+        # (i, j) positions are only used when talking to the world.
         self.visited = set()       # Cells where percepts have been acquired.
         self.safe_map = set()      # Cells inferred safe but not yet visited.
-        self.cnf = []              # Global CNF knowledge base.
+        self.frontier = set()      # Unvisited neighbors of visited cells.
+        self.cnf = set()           # Global CNF knowledge base, one frozenset per clause.
+        self.unit_lits = set()     # Literals asserted by unit clauses in self.cnf.
+        self.percept_cache = {}    # Percepts observed at each visited cell.
+        self.breeze_cells = set()  # Visited cells with a breeze.
+        self.stench_cells = set()  # Visited cells with a stench.
 
         # World dimensions and SAT solver setup.
         self.world_size = world.size
         self.offset = self.world_size * self.world_size
-        self.solver = Glucose3()
+        self.solver = Glucose(incr=True)
+
+        # Neighbor table: the neighbor cell ids of every cell id.
+        size = self.world_size
+        self.neighbors = []
+        for i in range(size):
+            for j in range(size):
+                nbs = []
+                if i > 0: nbs.append((i - 1) * size + j)
+                if i < size - 1: nbs.append((i + 1) * size + j)
+                if j > 0: nbs.append(i * size + j - 1)
+                if j < size - 1: nbs.append(i * size + j + 1)
+                self.neighbors.append(tuple(nbs))
+        self.forced_lits = set()   # Hazard literals entailed by the KB (refreshed each tick).
+        self.safe_cells = bytearray(self.offset)  # 1 where forced_lits rules out both hazards.
+        self._hazard_cache = {}    # infer_hazards results for the current forced_lits.
+        self._passable_cache = {}  # BFS passability bitmaps for the current forced_lits.
 
         # Goal management: if gold is seen, the agent’s goal is to return home.
         self.has_gold = False
         self.goal = None
-        self.start = getattr(world, 'start', (0, 0))
+        self.start = self._to_idx(getattr(world, 'start', (0, 0)))
 
         # For path planning.
-        self.current_path = []     # Planned route (list of cells).
-        self.current_target = None # Target cell for current plan.
+        self.current_path = []     # Planned route (list of cell ids).
+        self.current_target = None # Target cell id for current plan.
         self.add_exactly_one_wumpus_constraint()
+        self.refresh_forced_literals()
         self.infer_pit_by_exclusion()
         
     # --- Variable Mapping ---
-    def deduce_pit_from_breeze_constraint(self):
-        for cell in self.visited:
-            percept = self.world.get_percepts(cell)
-            if not percept.get("breeze", False):
-                continue
-
+    def _deduce_from_percepts(self):
+        # One pass over the breezy and smelly cells: partition each cell's
+        # neighbors once and apply both the pit and the Wumpus deductions.
+        for cell in self.breeze_cells | self.stench_cells:
             neighbors = self.get_neighbors(cell)
-            known_safe = []
-            unknown = []
-
-            for n in neighbors:
-                if n in self.visited:
-                    known_safe.append(n)
-                else:
-                    unknown.append(n)
-
+            unknown = [n for n in neighbors if n not in self.visited]
             # Direct deduction: 3 known safe, 1 unknown
-            if len(unknown) == 1 and len(known_safe) == len(neighbors) - 1:
-                must_be_pit = unknown[0]
-                clause = [self.pit_var(must_be_pit)]
-                if clause not in self.cnf:
-                    self.cnf.append(clause)
-                    self.solver.add_clause(clause)
-                    # if self.debug:
-                    #     print(f"Inferred pit at {must_be_pit} due to breeze at {cell} and 3 safe neighbors.")
-            else:
-                # SAT-based backup: all neighbors except one are UNSAT with pit assumption
-                possible_pits = []
-                for n in neighbors:
-                    if self.solver.solve(assumptions=[self.pit_var(n)]):
-                        possible_pits.append(n)
-                if len(possible_pits) == 1:
-                    must_be_pit = possible_pits[0]
-                    clause = [self.pit_var(must_be_pit)]
-                    if clause not in self.cnf:
-                        self.cnf.append(clause)
-                        self.solver.add_clause(clause)
-                        # if self.debug:
-                        #     print(f"Inferred pit at {must_be_pit} via SAT deduction from breeze at {cell}.")
-
-
-    def deduce_wumpus_from_stench_constraint(self):
-        for cell in self.visited:
-            percept = self.world.get_percepts(cell)
-            if not percept.get("stench", False):
-                continue
-
-            neighbors = self.get_neighbors(cell)
-            known_safe = []
-            unknown = []
+            direct = len(unknown) == 1
 
-            for n in neighbors:
-                if n in self.visited:
-                    known_safe.append(n)
+            if cell in self.breeze_cells:
+                if direct:
+                    self._add_clause([self.pit_var(unknown[0])])
+                    # if self.debug:
+                    #     print(f"Inferred pit at {unknown[0]} due to breeze at {cell} and 3 safe neighbors.")
                 else:
-                    unknown.append(n)
+                    # SAT-based backup: all neighbors except one are UNSAT with pit assumption
+                    possible_pits = [n for n in neighbors if -self.pit_var(n) not in self.forced_lits]
+                    if len(possible_pits) == 1:
+                        self._add_clause([self.pit_var(possible_pits[0])])
+                        # if self.debug:
+                        #     print(f"Inferred pit at {possible_pits[0]} via SAT deduction from breeze at {cell}.")
 
-            # Direct deduction: 3 known safe, 1 unknown
-            if len(unknown) == 1 and len(known_safe) == len(neighbors) - 1:
-                must_be_wumpus = unknown[0]
-                clause = [self.wumpus_var(must_be_wumpus)]
-                if clause not in self.cnf:
-                    self.cnf.append(clause)
-                    self.solver.add_clause(clause)
+            if cell in self.stench_cells:
+                if direct:
+                    self._add_clause([self.wumpus_var(unknown[0])])
                     # if self.debug:
-                    #     print(f"Inferred Wumpus at {must_be_wumpus} due to stench at {cell} and 3 safe neighbors.")
-            else:
-                # SAT-based backup: all neighbors except one are UNSAT with wumpus assumption
-                possible_wumpus = []
-                for n in neighbors:
-                    if self.solver.solve(assumptions=[self.wumpus_var(n)]):
-                        possible_wumpus.append(n)
-                if len(possible_wumpus) == 1:
-                    must_be_wumpus = possible_wumpus[0]
-                    clause = [self.wumpus_var(must_be_wumpus)]
-                    if clause not in self.cnf:
-                        self.cnf.append(clause)
-                        self.solver.add_clause(clause)
+                    #     print(f"Inferred Wumpus at {unknown[0]} due to stench at {cell} and 3 safe neighbors.")
+                else:
+                    # SAT-based backup: all neighbors except one are UNSAT with wumpus assumption
+                    possible_wumpus = [n for n in neighbors if -self.wumpus_var(n) not in self.forced_lits]
+                    if len(possible_wumpus) == 1:
+                        self._add_clause([self.wumpus_var(possible_wumpus[0])])
                         # if self.debug:
-                        #     print(f"Inferred Wumpus at {must_be_wumpus} via SAT deduction from stench at {cell}.")
-
+                        #     print(f"Inferred Wumpus at {possible_wumpus[0]} via SAT deduction from stench at {cell}.")
 
     def infer_pit_by_exclusion(self):
-        for i in range(self.world_size):
-            for j in range(self.world_size):
-                cell = (i, j)
-                if cell in self.visited or not self.is_cell_safe(cell):
-                    continue  # Already visited or known hazard
-
-                neighbors = self.get_neighbors(cell)
-                breeze_neighbors = [n for n in neighbors if n in self.visited and self.world.get_percepts(n).get("breeze", False)]
-                unvisited_neighbors = [n for n in neighbors if n not in self.visited]
-
-                if len(breeze_neighbors) >= 3 and len(unvisited_neighbors) == 1:
-                    must_be_pit = unvisited_neighbors[0]
-                    clause = [self.pit_var(must_be_pit)]
-                    self.cnf.append(clause)
-                    self.solver.add_clause(clause)
-                    # if self.debug:
-                    #     print(f"Inferred pit at {must_be_pit} due to 3 surrounding breezes.")
+        # Only cells next to at least 3 breezes can fire, so count breezy
+        # neighbors from breeze_cells instead of scanning the whole grid.
+        breeze_counts = Counter(n for b in self.breeze_cells for n in self.get_neighbors(b))
+        for cell, count in breeze_counts.items():
+            if count < 3 or cell in self.visited or not self.is_cell_safe(cell):
+                continue  # Too few breezes, already visited or known hazard
+
+            unvisited_neighbors = [n for n in self.get_neighbors(cell) if n not in self.visited]
+
+            if len(unvisited_neighbors) == 1:
+                must_be_pit = unvisited_neighbors[0]
+                self._add_clause([self.pit_var(must_be_pit)])
+                # if self.debug:
+                #     print(f"Inferred pit at {self._to_pos(must_be_pit)} due to 3 surrounding breezes.")
 
     def add_exactly_one_wumpus_constraint(self):
-        all_cells = [(i, j) for i in range(self.world_size) for j in range(self.world_size)]
-        wumpus_vars = [self.wumpus_var(cell) for cell in all_cells]
+        wumpus_vars = [self.wumpus_var(cell) for cell in range(self.offset)]
 
         # At least one Wumpus
-        self.cnf.append(wumpus_vars)
-        self.solver.add_clause(wumpus_vars)
+        self._add_clause(wumpus_vars)
 
-        # At most one Wumpus: pairwise exclusions
-        for i in range(len(wumpus_vars)):
-            for j in range(i + 1, len(wumpus_vars)):
-                clause = [-wumpus_vars[i], -wumpus_vars[j]]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
+        # At most one Wumpus: bitwise encoding, O(n log n) clauses instead of the
+        # O(n^2) pairwise exclusions. Its log2(n) auxiliary variables are
+        # numbered after the pit and Wumpus variables; the agent allocates no others.
+        at_most_one = CardEnc.atmost(lits=wumpus_vars, bound=1, top_id=2 * self.offset,
+                                     encoding=EncType.bitwise)
+        for clause in at_most_one.clauses:
+            self._add_clause(clause)
 
         # if self.debug:
         #     print("Added exactly-one Wumpus constraint.")
         
+    def _add_clause(self, clause):
+        # Add a clause to both the CNF record and the solver, skipping duplicates.
+        # Clauses already satisfied by a unit are dropped, and literals whose
+        # negation is a unit are removed before the clause is stored.
+        units = self.unit_lits
+        if len(clause) > 1:
+            if not units.isdisjoint(clause):
+                return
+            strengthened = [lit for lit in clause if -lit not in units]
+            if strengthened:  # An empty result means the KB is inconsistent; keep it whole.
+                clause = strengthened
+        key = frozenset(clause)
+        if key in self.cnf:
+            return
+        self.cnf.add(key)
+        self.solver.add_clause(clause)
+        if len(clause) == 1:
+            self.unit_lits.add(clause[0])
+
     def pit_var(self, cell):
-        i, j = cell
-        return i * self.world_size + j + 1
+        return cell + 1
 
     def wumpus_var(self, cell):
-        i, j = cell
-        return self.offset + i * self.world_size + j + 1
+        return self.offset + cell + 1
 
     # --- CNF Update from Percepts ---
     def update_cnf_for_cell(self, pos):
-        percept = self.world.get_percepts(pos)
+        if pos in self.visited:
+            return  # Percepts never change, so a revisit adds nothing.
+        percept = self.world.get_percepts(self._to_pos(pos))
+        self.percept_cache[pos] = percept
         self.visited.add(pos)
+        if percept.get('breeze', False):
+            self.breeze_cells.add(pos)
+        if percept.get('stench', False):
+            self.stench_cells.add(pos)
+        self.frontier.discard(pos)
+        for n in self.get_neighbors(pos):
+            if n not in self.visited:
+                self.frontier.add(n)
         # if self.debug:
         #     print(f"update_cnf_for_cell: at {pos} with percepts {percept}")
-        for neighbor in self.get_neighbors(pos):
-            # Pits:
-            if not percept.get('breeze', False):
-                clause = [-self.pit_var(neighbor)]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
-                # if self.debug:
-                #     print(f"Added clause (no pit at {neighbor}): {clause}")
-            else:
-                clause = [self.pit_var(n) for n in self.get_neighbors(pos)]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
-                # if self.debug:
-                #     print(f"Added clause (breeze at {pos}): {clause}")
-            # Wumpus:
-            if not percept.get('stench', False):
-                clause = [-self.wumpus_var(neighbor)]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
-                # if self.debug:
-                #     print(f"Added clause (no Wumpus at {neighbor}): {clause}")
-            else:
-                clause = [self.wumpus_var(n) for n in self.get_neighbors(pos)]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
-                # if self.debug:
-                #     print(f"Added clause (stench at {pos}): {clause}")
+        neighbors = self.get_neighbors(pos)
+        # Pits: a breeze yields one disjunction over the neighbors, no breeze a
+        # unit clause per neighbor.
+        if percept.get('breeze', False):
+            pit_clauses = [[self.pit_var(n) for n in neighbors]]
+            # if self.debug:
+            #     print(f"Added clause (breeze at {pos}): {pit_clauses[0]}")
+        else:
+            pit_clauses = [[-self.pit_var(n)] for n in neighbors]
+            # if self.debug:
+            #     print(f"Added clauses (no pit around {pos}): {pit_clauses}")
+        # Wumpus:
+        if percept.get('stench', False):
+            wumpus_clauses = [[self.wumpus_var(n) for n in neighbors]]
+            # if self.debug:
+            #     print(f"Added clause (stench at {pos}): {wumpus_clauses[0]}")
+        else:
+            wumpus_clauses = [[-self.wumpus_var(n)] for n in neighbors]
+            # if self.debug:
+            #     print(f"Added clauses (no Wumpus around {pos}): {wumpus_clauses}")
+        # Units first, so _add_clause can strengthen the disjunctions against them.
+        for clause in sorted(pit_clauses + wumpus_clauses, key=len):
+            self._add_clause(clause)
         if percept.get("glitter", False):
             self.has_gold = True
             self.goal = self.start
@@ -226,223 +255,227 @@ class CNFAgent(Agent):
             #     print("Gold detected! Setting goal to return home.")
 
     # --- CNF-Based Safety Inference ---
+    def refresh_forced_literals(self):
+        # Collect every pit/Wumpus literal the KB entails in one sweep. Start from
+        # the literals of a single model and drop any literal that another model
+        # disagrees with; a literal survives only if assuming its negation fails.
+        # Unit propagation settles some candidates outright; the rest need solve().
+        num_hazard_vars = 2 * self.offset
+        self._hazard_cache.clear()
+        self._passable_cache.clear()
+        if not self.solver.solve():
+            # Inconsistent KB: every literal is entailed.
+            self.forced_lits = {v for v in range(1, num_hazard_vars + 1)} | \
+                               {-v for v in range(1, num_hazard_vars + 1)}
+            self.safe_cells = bytearray([1]) * self.offset
+            return
+        candidates = set(self.solver.get_model()[:num_hazard_vars])
+        # Unit clauses are entailed as they stand; no need to test them.
+        forced = candidates & self.unit_lits
+        candidates -= forced
+        # Steer the solver's phases against every candidate, so one model tends
+        # to refute many of them at once. Phases set this way stay in force, so
+        # once per sweep is enough. They also outlive the sweep, but every
+        # solve() on this solver happens here, and the only one they reach is
+        # the next sweep's first model, which may be any model.
+        self.solver.set_phases([-c for c in candidates])
+        while candidates:
+            lit = candidates.pop()
+            no_conflict, _ = self.solver.propagate(assumptions=[-lit])
+            if no_conflict and self.solver.solve(assumptions=[-lit]):
+                candidates.intersection_update(self.solver.get_model()[:num_hazard_vars])
+            else:
+                forced.add(lit)
+        self.forced_lits = forced
+        # Flat safety bitmap read by is_cell_safe, passable_mask and risk_grid.
+        offset = self.offset
+        self.safe_cells = bytearray(-(c + 1) in forced and -(offset + c + 1) in forced
+                                    for c in range(offset))
+        # if self.debug:
+        #     print(f"refresh_forced_literals: {len(forced)} entailed literals")
+
     def is_cell_safe(self, cell):
-        pit_unsat = not self.solver.solve(assumptions=[self.pit_var(cell)])
-        wumpus_unsat = not self.solver.solve(assumptions=[self.wumpus_var(cell)])
         # if self.debug:
-        #     print(f"is_cell_safe({cell}): pit_unsat={pit_unsat}, wumpus_unsat={wumpus_unsat}")
-        return pit_unsat and wumpus_unsat
+        #     print(f"is_cell_safe({cell}): {bool(self.safe_cells[cell])}")
+        return self.safe_cells[cell] == 1
 
     def infer_hazards(self, cell):
-        no_pit_unsat = not self.solver.solve(assumptions=[-self.pit_var(cell)])
-        pit_unsat = not self.solver.solve(assumptions=[self.pit_var(cell)])
-        pit_status = "H!" if no_pit_unsat else ("NoH" if pit_unsat else "?")
-        no_wumpus_unsat = not self.solver.solve(assumptions=[-self.wumpus_var(cell)])
-        wumpus_unsat = not self.solver.solve(assumptions=[self.wumpus_var(cell)])
-        wumpus_status = "W!" if no_wumpus_unsat else ("NoW" if wumpus_unsat else "?")
-        return pit_status, wumpus_status
+        status = self._hazard_cache.get(cell)
+        if status is not None:
+            return status
+        pit, wumpus = self.pit_var(cell), self.wumpus_var(cell)
+        pit_status = "H!" if pit in self.forced_lits else ("NoH" if -pit in self.forced_lits else "?")
+        wumpus_status = "W!" if wumpus in self.forced_lits else ("NoW" if -wumpus in self.forced_lits else "?")
+        status = (pit_status, wumpus_status)
+        self._hazard_cache[cell] = status
+        return status
+
+    def cell_status(self, cell):
+        # One answer per cell from forced_lits: 'safe', 'unsafe_pit',
+        # 'unsafe_wumpus' or 'unknown'.
+        if self.safe_cells[cell]:
+            return 'safe'
+        if cell + 1 in self.forced_lits:
+            return 'unsafe_pit'
+        if self.offset + cell + 1 in self.forced_lits:
+            return 'unsafe_wumpus'
+        return 'unknown'
 
     # ============================================
     # Risk Estimation Module
     # ============================================
-    def risk_estimate(self, cell):
-        pit_status, wumpus_status = self.infer_hazards(cell)
-        risk = 0.0
-        if pit_status == "H!":
-            risk += 1000.0
-        elif pit_status == "NoH":
-            risk -= 50
-        if wumpus_status == "W!":
-            risk += 1000.0
-        elif wumpus_status == "NoW":
-            risk -= 50
-        for n in self.get_neighbors(cell):
-            if n in self.visited:
-                percept = self.world.get_percepts(n)
-                if percept.get("breeze", False):
-                    risk += 0
-                if percept.get("stench", False):
-                    risk += 0
-        risk += manhattan_distance(cell, self.world.agent_pos) / (self.world_size * 2)/100
-        if (cell in self.visited):
-            risk += 2
-        elif (self.is_cell_safe(cell)):
-            risk -= 5000
-        else:
-            risk -= 25
-        # if self.debug:
-        #     print(f"risk_estimate({cell}) = {risk}")
-        return risk
+    def risk_grid(self, current_pos):
+        # Risk of every unvisited cell in one row-major sweep, read from
+        # forced_lits and the safe_cells bitmap. Proven hazards cost 1000 each,
+        # proven-safe cells are strongly preferred, and distance from the agent
+        # only breaks ties. Returns a list of (risk, cell id).
+        forced = self.forced_lits
+        safe = self.safe_cells
+        visited = self.visited
+        size = self.world_size
+        scale = size * 2
+        ax, ay = self._to_pos(current_pos)
+        risks = []
+        for cell in range(self.offset):
+            if cell in visited:
+                continue
+            i, j = divmod(cell, size)
+            pit = cell + 1
+            wumpus = self.offset + pit
+            risk = 0.0
+            if pit in forced:
+                risk += 1000.0
+            elif -pit in forced:
+                risk -= 50
+            if wumpus in forced:
+                risk += 1000.0
+            elif -wumpus in forced:
+                risk -= 50
+            risk += (abs(i - ax) + abs(j - ay)) / scale / 100
+            risk -= 5000 if safe[cell] else 25
+            risks.append((risk, cell))
+        return risks
 
     # ============================================
     # Consolidated Safe Path Search
     # ============================================
     def find_closest_safe_path(self, current_pos):
-        best_path = []
-        best_candidate = current_pos
-        orderedSafeMap = sorted(self.safe_map, key=lambda n: manhattan_distance(n, current_pos))
-        # if self.debug:
-        #     print(f"find_closest_safe_path: safe map = {orderedSafeMap}")
-        for candidate in orderedSafeMap:
-            # print("Looking for an alternative path")
-            path = self.find_safe_path(current_pos, candidate)
-            if path is None:
-                # if self.debug:
-                #     print("Looking for an alternative path")
-                continue
-            else:
-                best_path = path
-                best_candidate = candidate
-                break
-            # if self.debug:
-            #     print(f"Candidate {candidate}: path = {path} | length = {len(path)}")
-            # candidates.append((candidate, path, len(path)))
-        if best_candidate == current_pos:
+        # One BFS from the agent over safe/visited cells gives a route to every
+        # reachable safe-map cell; the Manhattan-closest of those is the target.
+        parents = bfs_parents(self.neighbors, self.passable_mask(True), current_pos)
+        reachable = [c for c in self.safe_map if parents[c] != -1 and c != current_pos]
+        if not reachable:
             # if self.debug:
             #     print("find_closest_safe_path: no valid candidate found")
             return None, None
+        size = self.world_size
+        ax, ay = divmod(current_pos, size)
+        dist = {n: abs(n // size - ax) + abs(n % size - ay) for n in reachable}
+        closest = min(dist.values())
+        ties = [n for n in reachable if dist[n] == closest]
+        if len(ties) > 1:
+            rank = self.safe_map_order()
+            best_candidate = min(ties, key=rank.__getitem__)
+        else:
+            best_candidate = ties[0]
+        best_path = self.path_from_parents(parents, best_candidate)
         # if self.debug:
-        #     print(f"find_closest_safe_path: Best candidate: {best_candidate} with path: {best_path}, length: {manhattan_distance(best_candidate, current_pos)}")
+        #     print(f"find_closest_safe_path: Best candidate: {best_candidate} with path: {best_path}, length: {len(best_path) - 1}")
         return best_candidate, best_path
 
+    def safe_map_order(self):
+        # Equally close safe-map cells are chosen in the order the original
+        # (row, col) tuple sets iterated them. Rebuild those sets the way
+        # choose_action used to: visited in first-visit order (percept_cache
+        # keeps it), then the safe-map neighbors of each visited cell.
+        visited = set()
+        for cell in self.percept_cache:
+            visited.add(self._to_pos(cell))
+        safe = set()
+        for pos in visited:
+            for n in self.neighbors[self._to_idx(pos)]:
+                if n in self.safe_map:
+                    safe.add(self._to_pos(n))
+        return {self._to_idx(pos): rank for rank, pos in enumerate(safe)}
 
     # ============================================
     # Helper Functions
     # ============================================
     def get_neighbors(self, pos):
-        x, y = pos
-        nbs = []
-        if x > 0: nbs.append((x - 1, y))
-        if x < self.world.size - 1: nbs.append((x + 1, y))
-        if y > 0: nbs.append((x, y - 1))
-        if y < self.world.size - 1: nbs.append((x, y + 1))
-        return nbs
+        return self.neighbors[pos]
+
+    def _to_idx(self, pos):
+        return pos[0] * self.world_size + pos[1]
+
+    def _to_pos(self, idx):
+        return divmod(idx, self.world_size)
+
+    def passable_mask(self, include_visited):
+        # Bitmap over cell ids of the cells a BFS may enter: cells
+        # proven safe, plus visited cells when include_visited is set.
+        mask = self._passable_cache.get(include_visited)
+        if mask is None:
+            mask = bytearray(self.safe_cells)
+            if include_visited:
+                for cell in self.visited:
+                    mask[cell] = 1
+            self._passable_cache[include_visited] = mask
+        return mask
+
+    def path_from_parents(self, parents, target_idx):
+        path = [target_idx]
+        idx = target_idx
+        while parents[idx] != idx:
+            idx = parents[idx]
+            path.append(idx)
+        path.reverse()
+        return path
 
     def direction_from_to(self, current, neighbor):
-        cx, cy = current
-        nx, ny = neighbor
-        if nx < cx: return 'up'
-        if nx > cx: return 'down'
-        if ny < cy: return 'left'
-        if ny > cy: return 'right'
-        return random.choice(['up', 'down', 'left', 'right'])
+        cx, cy = self._to_pos(current)
+        nx, ny = self._to_pos(neighbor)
+        # Path steps are always to an adjacent cell; anything else moves at random.
+        return self._DIR.get((nx - cx, ny - cy)) or random.choice(_DIRS)
     
     def is_known_hole(self, cell):
-        pit_status, wumpus_status = self.infer_hazards(cell)
-        return pit_status == "H!" or wumpus_status == "W!"
-
-    def find_safe_path(self, start, target):
-        queue = deque([start])
-        came_from = {start: None}
-
-        while queue:
-            cur = queue.popleft()
-
-            if cur == target:
-                path = []
-                while cur:
-                    path.append(cur)
-                    cur = came_from[cur]
-                path.reverse()
-                # if self.debug:
-                #     print(f"find_safe_path: path found {path}")
-                return path
-
-            neighbors = sorted(self.get_neighbors(cur), key=lambda n: manhattan_distance(n, target))
-            # if (neighbors):
-            #     for myN in neighbors:
-                    # print(f"neighbors: {myN}")
-            for n in neighbors:
-                if n in came_from:
-                    continue  # already visited in BFS
-
-                # print(f"neighbors1: {n}")
-                
-                pit_status, wumpus_status = self.infer_hazards(n)
-                if (pit_status != "NoH" or wumpus_status != "NoW") and n not in self.visited:
-                    continue  # skip confirmed hazards
-
-                # print(f"neighbors2: {n}")
-                
-                # ✅ Allow all known safe cells, whether visited or not
-                if self.is_cell_safe(n) or n in self.visited:
-                    came_from[n] = cur
-                    queue.append(n)
+        return self.cell_status(cell) in ('unsafe_pit', 'unsafe_wumpus')
 
-        # if self.debug:
-        #     print(f"find_safe_path: no path from {start} to {target}")
-        return None
-
-    def find_safe_path_to_risky(self, start, target):
-        queue = deque([start])
-        came_from = {start: None}
-
-        while queue:
-            cur = queue.popleft()
-
-            if cur == target:
-                path = []
-                while cur:
-                    path.append(cur)
-                    cur = came_from[cur]
-                path.reverse()
-                # if self.debug:
-                #     print(f"find_safe_path: path found {path}")
-                return path
-
-            neighbors = sorted(self.get_neighbors(cur), key=lambda n: manhattan_distance(n, target))
-            for n in neighbors:
-                if n != target:
-                    if n in came_from:
-                        continue  # already visited in BFS
-
-                    pit_status, wumpus_status = self.infer_hazards(n)
-                    if pit_status != "NoH" or wumpus_status != "NoW":
-                        continue  # skip confirmed hazards
-                # ✅ Allow all known safe cells, whether visited or not
-                if self.is_cell_safe(n) or n == target:
-                    came_from[n] = cur
-                    queue.append(n)
-
-        # if self.debug:
-        #     print(f"find_safe_path: no path from {start} to {target}")
-        return None
+    def find_safe_paths_to_risky(self, start):
+        # One BFS through proven-safe cells only; each (unsafe) cell on its
+        # border may be entered as the final step. Returns the parent table.
+        return bfs_parents_to_blocked(self.neighbors, self.passable_mask(False), start)
 
     # ============================================
     # Decision Making Module
     # ============================================
     def choose_action(self):
-        current_pos = self.world.agent_pos
-
-        # 1. Update knowledge at the current cell.
-        self.update_cnf_for_cell(current_pos)
-        
-        self.deduce_pit_from_breeze_constraint()
-        self.deduce_wumpus_from_stench_constraint()
+        current_pos = self._to_idx(self.world.agent_pos)
+
+        # 1. Update knowledge at the current cell. Revisiting a cell leaves the
+        # KB and visited set as they were, so the last refresh still holds.
+        if current_pos not in self.visited:
+            self.update_cnf_for_cell(current_pos)
+            self.refresh_forced_literals()
+
+            kb_size = len(self.cnf)
+            self._deduce_from_percepts()
+            if len(self.cnf) != kb_size:
+                self.refresh_forced_literals()
         # if self.debug:
         #     print(f"CNF now has {len(self.cnf)} clauses after update at {current_pos}.")
 
-        # 2. Refresh safe_map: add neighbors of visited cells that are safe.
-        self.safe_map.clear()
-        for cell in self.visited:
-            for neighbor in self.get_neighbors(cell):
-                # if self.debug:
-                #     print(f"visited cells: {neighbor}")
-
-                pit_status, wumpus_status = self.infer_hazards(neighbor)
-                if pit_status != "NoH" or wumpus_status != "NoW":
-                    # if self.debug:
-                    #     print(f"pit_status: {pit_status}, wumpus_status: {wumpus_status}")
-                    continue
-                if neighbor not in self.visited and self.is_cell_safe(neighbor):
-                    self.safe_map.add(neighbor)
-                    # if self.debug:
-                    #     print(f"safe cells: {self.safe_map}")
+        # 2. Update safe_map from the frontier: the KB only grows, so a cell
+        # proven safe stays safe and only unproven frontier cells need checking.
+        self.safe_map.discard(current_pos)
+        self.safe_map |= {cell for cell in self.frontier
+                          if cell not in self.safe_map and self.is_cell_safe(cell)}
+        # if self.debug:
+        #     print(f"safe cells: {self.safe_map}")
 
         move_type = None  # To log the type of move.
 
         # 3. If carrying gold, plan a path home.
-        # if self.has_gold and self.goal:
+        # if self.has_gold and self.goal is not None:
         #     path = self.find_visited_path(current_pos, self.goal)
         #     if path and len(path) > 1:
         #         self.current_path = path
@@ -452,7 +485,7 @@ class CNFAgent(Agent):
         #         return self.direction_from_to(current_pos, path[1])
 
         # 4. Follow an existing plan if still valid.
-        # if self.current_path and self.current_target:
+        # if self.current_path and self.current_target is not None:
         #     if len(self.current_path) > 1:
         #         next_cell = self.current_path[1]
         #         pit_status, wumpus_status = self.infer_hazards(next_cell)
@@ -464,10 +497,9 @@ class CNFAgent(Agent):
         #     self.current_path = []
         #     self.current_target = None
 
-        # 5. Use consolidated safe path search.
         # 5. Use consolidated closest safe path search.
         candidate, path = self.find_closest_safe_path(current_pos)
-        if candidate and path and len(path) > 1:
+        if candidate is not None and path and len(path) > 1:
             # if self.debug:
             #     print(f"Current Path: {path}")
             self.current_path = path
@@ -478,33 +510,23 @@ class CNFAgent(Agent):
             return self.direction_from_to(current_pos, path[1])
 
 
-        # 6. Fallback: Risk-based evaluation.
-        risky_candidates = []
-        for i in range(self.world_size):
-            for j in range(self.world_size):
-                cell = (i, j)
-                if (cell in self.visited):
-                    continue
-                # if self.debug:
-                #     print(f"Current Path: {cell}")
-                risk = self.risk_estimate(cell)
-                risky_candidates.append((cell, risk))
-        while risky_candidates:
-            target, _ = min(risky_candidates, key=lambda t: t[1])
-            if target:
-                path = self.find_safe_path_to_risky(current_pos, target)
-                if path and len(path) > 1:
-                    self.current_path = path
-                    self.current_target = target
-                    move_type = "risky"
-                    # print(f"Move type: {move_type}")
-                    return self.direction_from_to(current_pos, path[1])
-                risky_candidates.remove(min(risky_candidates, key=lambda t: t[1]))
+        # 6. Fallback: Risk-based evaluation. A single BFS gives a route to
+        # every candidate; take the lowest-risk one that can be reached.
+        parents = self.find_safe_paths_to_risky(current_pos)
+        reachable = [rc for rc in self.risk_grid(current_pos) if parents[rc[1]] != -1]
+        if reachable:
+            _, target = min(reachable)
+            path = self.path_from_parents(parents, target)
+            self.current_path = path
+            self.current_target = target
+            move_type = "risky"
+            # print(f"Move type: {move_type}")
+            return self.direction_from_to(current_pos, path[1])
 
         # 7. Fallback: Choose the closest adjacent neighbor.
         nbs = self.get_neighbors(current_pos)
         if nbs:
-            best = min(nbs, key=lambda cell: manhattan_distance(cell, current_pos))
+            best = nbs[0]  # Every neighbor is at distance 1.
             self.current_path = [current_pos, best]
             self.current_target = best
             move_type = "random fallback"
@@ -514,22 +536,23 @@ class CNFAgent(Agent):
         # 8. Ultimate fallback: Random move.
         move_type = "ultimate random"
         # print(f"Move type: {move_type}")
-        return random.choice(['up', 'down', 'left', 'right'])
+        return random.choice(_DIRS)
 
     # ============================================
     # World View Module
     # ============================================
     def construct_world_view(self):
         size = self.world.size
+        agent = self._to_idx(self.world.agent_pos)
         view = []
         for i in range(size):
             row = []
             for j in range(size):
-                cell = (i, j)
-                if cell == self.world.agent_pos:
+                cell = i * size + j
+                if cell == agent:
                     row.append("A")
                 elif cell in self.visited:
-                    percept = self.world.get_percepts(cell)
+                    percept = self.percept_cache[cell]
                     code = "V"
                     if percept.get("breeze", False):
                         code += "B"
@@ -539,7 +562,7 @@ class CNFAgent(Agent):
                         code += "G"
                     row.append(code)
                 else:
-                    if self.is_cell_safe(cell):
+                    if self.cell_status(cell) == 'safe':
                         row.append("S")
                     else:
                         pit_status, wumpus_status = self.infer_hazards(cell)
@@ -555,4 +578,4 @@ class CNFAgent(Agent):
 
 class RandomWalkAgent(Agent):
     def choose_action(self):
-        return random.choice(['up', 'down', 'left', 'right'])
+        return _DIRS[random.getrandbits(2)]
@@ -2,7 +2,14 @@ import random
 from pysat.solvers import Glucose3
 from collections import deque
 
+# Move names, indexed by two random bits in RandomWalkAgent.
+_DIRS = ('up', 'down', 'left', 'right')
+
 class Agent:
+    # Grid offset of each move, and the move for each offset.
+    _DELTA = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+    _DIR = {delta: direction for direction, delta in _DELTA.items()}
+
     def __init__(self, world):
         self.world = world
 
@@ -11,28 +18,44 @@ class Agent:
 
     def move(self, direction):
         x, y = self.world.agent_pos
-        if direction == 'up':
-            new_pos = (x - 1, y)
-        elif direction == 'down':
-            new_pos = (x + 1, y)
-        elif direction == 'left':
-            new_pos = (x, y - 1)
-        elif direction == 'right':
-            new_pos = (x, y + 1)
-        else:
-            new_pos = (x, y)
-        self.world.move_agent(new_pos)
+        dx, dy = self._DELTA.get(direction, (0, 0))
+        self.world.move_agent((x + dx, y + dy))
 
 class CNFAgent(Agent):
+    # Most models kept at once, so rebuilding possible_lits stays cheap.
+    MAX_MODELS = 8
+
     def __init__(self, world, debug=False):
         super().__init__(world)
         self.debug = debug
 
+        # Cells are identified internally by their id i * size + j; positions
+        # are only converted at the world boundary (_to_idx / _to_pos).
+
         # Keep track of visited cells (cells where percepts have been acquired)
         self.visited = set()
-
-        # Global CNF knowledge base (list of clauses)
-        self.cnf = []
+        self.visited_mask = bytearray(world.size * world.size)  # 1 for each visited cell id.
+        self.breeze_cells = set()  # Visited cells with a breeze.
+        self.stench_cells = set()  # Visited cells with a stench.
+
+        # Unvisited neighbors of visited cells, and the cells proven safe so far.
+        # The CNF only grows, so a cell proven safe stays safe.
+        self.frontier = set()
+        self.known_safe = set()
+
+        # Facts that follow from unit reasoning alone, consulted before the solver.
+        # A missing breeze/stench rules out its neighbors directly; a breeze or
+        # stench with a single neighbor left un-ruled-out pins the hazard there.
+        self.known_no_pit = set()
+        self.known_no_wumpus = set()
+        self.known_pit = set()
+        self.known_wumpus = set()
+        self.breeze_neighbors = []  # Neighbor lists of breezy cells (one clause each).
+        self.stench_neighbors = []  # Neighbor lists of smelly cells (one clause each).
+
+        # Global CNF knowledge base, one frozenset per clause so duplicates are
+        # never added twice.
+        self.cnf = set()
 
         # World size and variable offset.
         self.world_size = world.size
@@ -40,6 +63,20 @@ class CNFAgent(Agent):
 
         # Use an incremental SAT solver—clauses will be added as they are discovered.
         self.solver = Glucose3()
+        # Models found so far (as literal sets) that still satisfy the CNF, and the
+        # literals true in at least one of them.
+        self.models = []
+        self.possible_lits = set()
+
+        # Percepts of a cell never change, so each one is fetched from the world once.
+        self.percept_cache = {}  # {cell: percept dict}
+
+        # Neighbor id lists depend only on the cell and the grid size; build them once.
+        self.neighbors = [self._compute_neighbors(cell) for cell in range(self.offset)]
+
+        # Knowledge-dependent part of risk_estimate per cell (hazard statuses and
+        # neighboring percepts). Cleared whenever a new cell is visited.
+        self.hazard_risk = {}  # {cell: risk before distance and experience}
 
         # A simple experience map: if a move to a cell eventually causes death,
         # we will add extra risk to that cell.
@@ -49,60 +86,84 @@ class CNFAgent(Agent):
         self.has_gold = False
         self.goal = None
         # Assume the world provides a starting position (default (0,0) if not)
-        self.start = getattr(world, 'start', (0, 0))
+        self.start = self._to_idx(getattr(world, 'start', (0, 0)))
+
+    def add_clause(self, clause):
+        """
+        Add a clause to both the CNF record and the solver, skipping duplicates.
+        Returns True if the clause was new.
+        """
+        key = frozenset(clause)
+        if key in self.cnf:
+            return False
+        self.cnf.add(key)
+        self.solver.add_clause(clause)
+        # A stored model survives the new clause if it already satisfies it;
+        # possible_lits only needs rebuilding when one does not.
+        kept = [m for m in self.models if not key.isdisjoint(m)]
+        if len(kept) != len(self.models):
+            self.models = kept
+            self.possible_lits = set().union(*kept)
+        return True
 
     # --- Variable Mapping ---
     def pit_var(self, cell):
-        i, j = cell
-        return i * self.world_size + j + 1
+        return cell + 1
 
     def wumpus_var(self, cell):
-        i, j = cell
-        return self.offset + i * self.world_size + j + 1
+        return self.offset + cell + 1
 
     # --- CNF Update from Percepts ---
     def update_cnf_for_cell(self, pos):
         """
-        Query the world at cell 'pos', add clauses to the SAT solver based on the percepts,
-        and mark pos as visited.
+        Query the world at cell id 'pos', add clauses to the SAT solver based on the percepts,
+        and mark pos as visited. Revisits return immediately, since percepts never change.
         """
-        percept = self.world.get_percepts(pos)
+        if pos in self.visited:
+            return
+        self.hazard_risk.clear()
+        percept = self.get_percepts(pos)
         self.visited.add(pos)
+        self.visited_mask[pos] = 1
         neighbors = self.get_neighbors(pos)
+        self.frontier.discard(pos)
+        for n in neighbors:
+            if n not in self.visited:
+                self.frontier.add(n)
 
         # For pits:
         if not percept.get('breeze', False):
             # No breeze means none of the neighbors has a pit.
+            self.known_no_pit.update(neighbors)
             for n in neighbors:
                 clause = [-self.pit_var(n)]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
-                if self.debug:
-                    print(f"[DEBUG] Added clause (no pit at {n}): {clause}")
+                if self.add_clause(clause) and self.debug:
+                    print(f"[DEBUG] Added clause (no pit at {self._to_pos(n)}): {clause}")
         else:
             # Breeze means at least one neighbor has a pit.
-            clause = [self.pit_var(n) for n in neighbors]
-            self.cnf.append(clause)
-            self.solver.add_clause(clause)
-            if self.debug:
-                print(f"[DEBUG] Added clause (breeze at {pos} implies pit in neighbors): {clause}")
+            self.breeze_cells.add(pos)
+            self.breeze_neighbors.append(neighbors)
+            clause = self.hazard_clause(neighbors, self.known_pit, self.known_no_pit, self.pit_var)
+            if clause and self.add_clause(clause) and self.debug:
+                print(f"[DEBUG] Added clause (breeze at {self._to_pos(pos)} implies pit in neighbors): {clause}")
 
         # For Wumpus:
         if not percept.get('stench', False):
             # No stench implies no neighbor contains the Wumpus.
+            self.known_no_wumpus.update(neighbors)
             for n in neighbors:
                 clause = [-self.wumpus_var(n)]
-                self.cnf.append(clause)
-                self.solver.add_clause(clause)
-                if self.debug:
-                    print(f"[DEBUG] Added clause (no Wumpus at {n}): {clause}")
+                if self.add_clause(clause) and self.debug:
+                    print(f"[DEBUG] Added clause (no Wumpus at {self._to_pos(n)}): {clause}")
         else:
             # Stench means at least one neighbor must contain the Wumpus.
-            clause = [self.wumpus_var(n) for n in neighbors]
-            self.cnf.append(clause)
-            self.solver.add_clause(clause)
-            if self.debug:
-                print(f"[DEBUG] Added clause (stench at {pos} implies Wumpus in neighbors): {clause}")
+            self.stench_cells.add(pos)
+            self.stench_neighbors.append(neighbors)
+            clause = self.hazard_clause(neighbors, self.known_wumpus, self.known_no_wumpus, self.wumpus_var)
+            if clause and self.add_clause(clause) and self.debug:
+                print(f"[DEBUG] Added clause (stench at {self._to_pos(pos)} implies Wumpus in neighbors): {clause}")
+
+        self.propagate_units()
 
         # Goal management: if gold is perceived, set the goal to the start (exit).
         if percept.get("glitter", False):
@@ -111,16 +172,77 @@ class CNFAgent(Agent):
             if self.debug:
                 print("[DEBUG] Gold found! Setting goal to return to start.")
 
+    def hazard_clause(self, neighbors, hazards, ruled_out, var):
+        """
+        Builds the "some neighbor holds the hazard" clause, simplified against what
+        unit reasoning already knows: ruled-out neighbors are dropped, and None is
+        returned if a neighbor is already known to hold the hazard. A clause left
+        with a single neighbor records that neighbor in 'hazards'.
+        """
+        if any(n in hazards for n in neighbors):
+            return None
+        # An empty result would mean contradictory percepts; keep the full clause then.
+        remaining = [n for n in neighbors if n not in ruled_out] or neighbors
+        if len(remaining) == 1:
+            hazards.add(remaining[0])
+        return [var(n) for n in remaining]
+
+    def propagate_units(self):
+        """
+        Unit propagation over the breeze/stench clauses: a clause whose neighbors
+        are all ruled out but one forces a hazard in that one. Only the no-hazard
+        sets ever shrink these clauses, so a single pass per update is enough.
+        """
+        for hazards, ruled_out, clauses in ((self.known_pit, self.known_no_pit, self.breeze_neighbors),
+                                            (self.known_wumpus, self.known_no_wumpus, self.stench_neighbors)):
+            for neighbors in clauses:
+                remaining = [n for n in neighbors if n not in ruled_out]
+                if len(remaining) == 1 and remaining[0] not in hazards:
+                    hazards.add(remaining[0])
+                    if self.debug:
+                        print(f"[DEBUG] Unit propagation: hazard forced at {self._to_pos(remaining[0])}")
+
     # --- CNF-based Safety and Hazard Inference ---
+    def is_possible(self, lit):
+        """
+        True if some model of the CNF makes lit true. Every model found is kept
+        for as long as it satisfies the CNF, so one solve answers this for all the
+        literals it assigns, across later queries and clause additions.
+        """
+        if lit in self.possible_lits:
+            return True
+        # Prefer the hazard literals no kept model has shown yet, so the model
+        # found here answers as many future queries as possible.
+        possible = self.possible_lits
+        self.solver.set_phases([v if v not in possible else -v
+                                for v in range(1, 2 * self.offset + 1)])
+        if self.solver.solve(assumptions=[lit]):
+            model = set(self.solver.get_model())
+            self.models.append(model)
+            if len(self.models) > self.MAX_MODELS:
+                del self.models[0]  # Forget the oldest model.
+                self.possible_lits = set().union(*self.models)
+            else:
+                self.possible_lits |= model
+            return True
+        return False
+
     def is_cell_safe(self, cell):
         """
         A cell is considered safe if assuming a pit or Wumpus there makes the CNF unsolvable.
+        The unit-propagation sets answer first; the solver is only asked about
+        hazards they leave open, and the Wumpus question only once a pit has been ruled out.
         """
-        pit_unsat = not self.solver.solve(assumptions=[self.pit_var(cell)])
-        wumpus_unsat = not self.solver.solve(assumptions=[self.wumpus_var(cell)])
+        if cell in self.known_pit or cell in self.known_wumpus:
+            return False
+        if cell not in self.known_no_pit and self.is_possible(self.pit_var(cell)):
+            if self.debug:
+                print(f"[DEBUG] Safety check for {self._to_pos(cell)}: pit possible")
+            return False
+        wumpus_unsat = cell in self.known_no_wumpus or not self.is_possible(self.wumpus_var(cell))
         if self.debug:
-            print(f"[DEBUG] Safety check for {cell}: pit_unsat={pit_unsat}, wumpus_unsat={wumpus_unsat}")
-        return pit_unsat and wumpus_unsat
+            print(f"[DEBUG] Safety check for {self._to_pos(cell)}: pit_unsat=True, wumpus_unsat={wumpus_unsat}")
+        return wumpus_unsat
 
     def infer_hazards(self, cell):
         """
@@ -130,20 +252,21 @@ class CNFAgent(Agent):
           "?"   => ambiguous.
         Uses the incremental solver with assumptions.
         """
-        no_pit_unsat = not self.solver.solve(assumptions=[-self.pit_var(cell)])
-        pit_unsat = not self.solver.solve(assumptions=[self.pit_var(cell)])
-        if no_pit_unsat:
+        # Unit-propagation facts settle a status without the solver; otherwise the
+        # second question is only needed when the first leaves the status open,
+        # and models kept from earlier queries often answer both.
+        pit = cell + 1                # pit_var(cell), inlined on this hot path
+        wumpus = self.offset + pit    # wumpus_var(cell)
+        if cell in self.known_pit or not self.is_possible(-pit):
             pit_status = "H!"
-        elif pit_unsat:
+        elif cell in self.known_no_pit or not self.is_possible(pit):
             pit_status = "NoH"
         else:
             pit_status = "?"
             
-        no_wumpus_unsat = not self.solver.solve(assumptions=[-self.wumpus_var(cell)])
-        wumpus_unsat = not self.solver.solve(assumptions=[self.wumpus_var(cell)])
-        if no_wumpus_unsat:
+        if cell in self.known_wumpus or not self.is_possible(-wumpus):
             wumpus_status = "W!"
-        elif wumpus_unsat:
+        elif cell in self.known_no_wumpus or not self.is_possible(wumpus):
             wumpus_status = "NoW"
         else:
             wumpus_status = "?"
@@ -156,50 +279,63 @@ class CNFAgent(Agent):
         Returns a floating-point risk score for entering a cell.
         Factors include CNF-based hazard inference, neighboring percepts,
         distance, and past experience.
+        The first two only change when a new cell is visited, so they are kept
+        in hazard_risk and only the distance and experience terms are recomputed.
         """
-        pit_status, wumpus_status = self.infer_hazards(cell)
-        risk = 0.0
-        if pit_status == "H!":
-            risk += 1.0
-        elif pit_status == "?":
-            risk += 0.5
-        if wumpus_status == "W!":
-            risk += 1.0
-        elif wumpus_status == "?":
-            risk += 0.5
-
-        # Add risk from nearby visited cells' percepts.
-        for n in self.get_neighbors(cell):
-            if n in self.visited:
-                percept = self.world.get_percepts(n)
-                if percept.get("breeze", False):
-                    risk += 0.25
-                if percept.get("stench", False):
-                    risk += 0.25
+        risk = self.hazard_risk.get(cell)
+        if risk is None:
+            pit_status, wumpus_status = self.infer_hazards(cell)
+            risk = 0.0
+            if pit_status == "H!":
+                risk += 1.0
+            elif pit_status == "?":
+                risk += 0.5
+            if wumpus_status == "W!":
+                risk += 1.0
+            elif wumpus_status == "?":
+                risk += 0.5
+
+            # Add risk from nearby visited cells' percepts.
+            neighbors = self.get_neighbors(cell)
+            risk += 0.25 * (sum(n in self.breeze_cells for n in neighbors) +
+                            sum(n in self.stench_cells for n in neighbors))
+            self.hazard_risk[cell] = risk
 
         # Add a factor for distance (normalized by grid size).
-        risk += self.find_distance(cell) / (self.world_size * 2)
+        x, y = divmod(cell, self.world_size)
+        cx, cy = self.world.agent_pos
+        risk += (abs(x - cx) + abs(y - cy)) / (self.world_size * 2)
 
         # Incorporate any additional risk learned from experience.
         risk += self.experience.get(cell, 0)
         return risk
 
-    def lookahead_risk(self, cell):
+    def lookahead_risk(self, cell, risks=None):
         """
         A simple lookahead that considers the cell's own risk plus
         the average risk of its unvisited neighbors.
+        'risks' optionally memoises risk_estimate across calls made for the
+        same knowledge and agent position, since neighboring candidates share cells.
         """
-        base_risk = self.risk_estimate(cell)
+        if risks is None:
+            risks = {}
+        base_risk = self._memo_risk(cell, risks)
         additional = 0.0
         count = 0
         for n in self.get_neighbors(cell):
             if n not in self.visited:
-                additional += self.risk_estimate(n)
+                additional += self._memo_risk(n, risks)
                 count += 1
         if count > 0:
             return base_risk + additional / count
         return base_risk
 
+    def _memo_risk(self, cell, risks):
+        risk = risks.get(cell)
+        if risk is None:
+            risk = risks[cell] = self.risk_estimate(cell)
+        return risk
+
     def update_experience(self, cell, outcome):
         """
         Update risk estimates based on outcomes.
@@ -208,65 +344,98 @@ class CNFAgent(Agent):
         if outcome == "death":
             self.experience[cell] = self.experience.get(cell, 0) + 1.0
             if self.debug:
-                print(f"[DEBUG] Experience updated for {cell}: now {self.experience[cell]} risk.")
+                print(f"[DEBUG] Experience updated for {self._to_pos(cell)}: now {self.experience[cell]} risk.")
 
     # --- Pathfinding: Using only Visited Cells ---
     def find_visited_path(self, start, target):
         """
         Uses BFS to find a path from start to target that traverses only visited cells.
-        Returns a list of cells representing the path, or None if no such path exists.
+        Returns a list of cell ids representing the path, or None if no such path exists.
+        Searches from both ends at once, always growing the smaller frontier by a
+        full layer, and stops where the two searches meet.
         """
-        queue = deque([start])
-        came_from = {start: None}
-        while queue:
-            cur = queue.popleft()
-            if cur == target:
-                path = []
-                while cur is not None:
-                    path.append(cur)
-                    cur = came_from[cur]
-                path.reverse()
-                if self.debug:
-                    print(f"[DEBUG] Found visited path: {path}")
-                return path
-            for n in self.get_neighbors(cur):
-                if n not in came_from and n in self.visited:
+        if start == target:
+            return [start]
+        if target not in self.visited:
+            if self.debug:
+                print(f"[DEBUG] No visited path from {self._to_pos(start)} to {self._to_pos(target)}")
+            return None
+        # Parent arrays indexed by cell id: -1 means unreached, and each root is
+        # its own parent. visited_mask replaces the set lookup on every edge.
+        visited = self.visited_mask
+        fwd = [-1] * self.offset
+        bwd = [-1] * self.offset
+        fwd[start] = start
+        bwd[target] = target
+        fwd_queue = deque([start])
+        bwd_queue = deque([target])
+        while fwd_queue and bwd_queue:
+            if len(fwd_queue) <= len(bwd_queue):
+                queue, came_from, other = fwd_queue, fwd, bwd
+            else:
+                queue, came_from, other = bwd_queue, bwd, fwd
+            for _ in range(len(queue)):
+                cur = queue.popleft()
+                for n in self.neighbors[cur]:
+                    if came_from[n] != -1 or not visited[n]:
+                        continue
                     came_from[n] = cur
+                    if other[n] != -1:
+                        # Walk back to start, then forward to target.
+                        path = [n]
+                        cell = n
+                        while fwd[cell] != cell:
+                            cell = fwd[cell]
+                            path.append(cell)
+                        path.reverse()
+                        cell = n
+                        while bwd[cell] != cell:
+                            cell = bwd[cell]
+                            path.append(cell)
+                        if self.debug:
+                            print(f"[DEBUG] Found visited path: {[self._to_pos(c) for c in path]}")
+                        return path
                     queue.append(n)
         if self.debug:
-            print(f"[DEBUG] No visited path from {start} to {target}")
+            print(f"[DEBUG] No visited path from {self._to_pos(start)} to {self._to_pos(target)}")
         return None
 
     # --- Helper Methods ---
+    def get_percepts(self, cell):
+        percept = self.percept_cache.get(cell)
+        if percept is None:
+            percept = self.world.get_percepts(self._to_pos(cell))
+            self.percept_cache[cell] = percept
+        return percept
+
     def get_neighbors(self, pos):
-        x, y = pos
+        return self.neighbors[pos]
+
+    def _compute_neighbors(self, cell):
+        size = self.world_size
+        x, y = self._to_pos(cell)
         nbs = []
         if x > 0:
-            nbs.append((x - 1, y))
-        if x < self.world.size - 1:
-            nbs.append((x + 1, y))
+            nbs.append(cell - size)
+        if x < size - 1:
+            nbs.append(cell + size)
         if y > 0:
-            nbs.append((x, y - 1))
-        if y < self.world.size - 1:
-            nbs.append((x, y + 1))
+            nbs.append(cell - 1)
+        if y < size - 1:
+            nbs.append(cell + 1)
         return nbs
 
-    def find_distance(self, cell):
-        cx, cy = self.world.agent_pos
-        return abs(cell[0] - cx) + abs(cell[1] - cy)
+    def _to_idx(self, pos):
+        return pos[0] * self.world_size + pos[1]
+
+    def _to_pos(self, idx):
+        return divmod(idx, self.world_size)
 
     def direction_from_to(self, current, neighbor):
-        cx, cy = current
-        nx, ny = neighbor
-        if nx < cx:
-            return 'up'
-        elif nx > cx:
-            return 'down'
-        elif ny < cy:
-            return 'left'
-        elif ny > cy:
-            return 'right'
-        return random.choice(['up', 'down', 'left', 'right'])
+        cx, cy = self._to_pos(current)
+        nx, ny = self._to_pos(neighbor)
+        # Path steps are always to an adjacent cell; anything else moves at random.
+        return self._DIR.get((nx - cx, ny - cy)) or random.choice(_DIRS)
 
     # --- World View ---
     def construct_world_view(self):
@@ -275,17 +444,20 @@ class CNFAgent(Agent):
           - "A" for the agent’s position.
           - "V" for visited cells with percept abbreviations (B for breeze, S for stench, G for glitter).
           - For unvisited cells, "S" if safe, or "U(...)" showing hazard inference.
+        Cells already proven safe skip the solver; every other unvisited cell is
+        classified by a single infer_hazards call.
         """
         size = self.world.size
+        agent = self._to_idx(self.world.agent_pos)
         view = []
         for i in range(size):
             row = []
             for j in range(size):
-                cell = (i, j)
-                if cell == self.world.agent_pos:
+                cell = i * size + j
+                if cell == agent:
                     row.append("A")
                 elif cell in self.visited:
-                    percept = self.world.get_percepts(cell)
+                    percept = self.get_percepts(cell)
                     code = "V"
                     if percept.get("breeze", False):
                         code += "B"
@@ -294,11 +466,13 @@ class CNFAgent(Agent):
                     if percept.get("glitter", False):
                         code += "G"
                     row.append(code)
+                elif cell in self.known_safe:
+                    row.append("S")
                 else:
-                    if self.is_cell_safe(cell):
+                    pit_status, wumpus_status = self.infer_hazards(cell)
+                    if pit_status == "NoH" and wumpus_status == "NoW":
                         row.append("S")
                     else:
-                        pit_status, wumpus_status = self.infer_hazards(cell)
                         row.append(f"U({pit_status},{wumpus_status})")
             view.append(row)
         return view
@@ -311,65 +485,68 @@ class CNFAgent(Agent):
 
     # --- Decision Making ---
     def choose_action(self):
-        current_pos = self.world.agent_pos
+        current_pos = self._to_idx(self.world.agent_pos)
+        # Manhattan distance from the agent, used as the sort key below.
+        size = self.world_size
+        cx, cy = self.world.agent_pos
+        distance = lambda cell: abs(cell // size - cx) + abs(cell % size - cy)
 
         # Update knowledge with current percepts.
         self.update_cnf_for_cell(current_pos)
 
         # If the agent has found gold, try to return to the exit.
-        if self.has_gold and self.goal:
+        if self.has_gold and self.goal is not None:
             path = self.find_visited_path(current_pos, self.goal)
             if path and len(path) > 1:
                 next_cell = path[1]
                 move = self.direction_from_to(current_pos, next_cell)
                 if self.debug:
-                    print(f"[DEBUG] Returning with gold via path {path} -> {move}")
+                    print(f"[DEBUG] Returning with gold via path {[self._to_pos(c) for c in path]} -> {move}")
                 return move
 
-        # First, look for safe unvisited cells.
-        safe_unvisited = []
-        for visited_cell in self.visited:
-            for cell in self.get_neighbors(visited_cell):
-                if cell not in self.visited and self.is_cell_safe(cell):
-                    safe_unvisited.append(cell)
+        # First, look for safe unvisited cells. Only frontier cells not yet
+        # proven safe need a solver call.
+        for cell in self.frontier:
+            if cell not in self.known_safe and self.is_cell_safe(cell):
+                self.known_safe.add(cell)
+        safe_unvisited = [cell for cell in self.frontier if cell in self.known_safe]
         if safe_unvisited:
-            target = min(safe_unvisited, key=lambda cell: self.find_distance(cell))
+            target = min(safe_unvisited, key=distance)
             path = self.find_visited_path(current_pos, target)
             if path and len(path) > 1:
                 next_cell = path[1]
                 move = self.direction_from_to(current_pos, next_cell)
                 if self.debug:
-                    print(f"[DEBUG] Moving toward safe cell {target} via path {path} -> {move}")
+                    print(f"[DEBUG] Moving toward safe cell {self._to_pos(target)} via path {[self._to_pos(c) for c in path]} -> {move}")
                 return move
             elif self.debug:
                 print("[DEBUG] No path found for safe move.")
 
-        # If no clearly safe move, evaluate all unvisited cells using lookahead risk.
+        # If no clearly safe move, evaluate the frontier cells using lookahead risk:
+        # a target without a visited neighbor cannot be approached anyway, so
+        # interior cells only ever led to the random fallback below.
         risky_candidates = []
-        for i in range(self.world_size):
-            for j in range(self.world_size):
-                cell = (i, j)
-                if cell in self.visited:
-                    continue
-                risk = self.lookahead_risk(cell)
-                risky_candidates.append((cell, risk))
-                if self.debug:
-                    print(f"[DEBUG] Lookahead risk for candidate {cell}: {risk}")
+        risks = {}  # risk_estimate per cell for this tick, shared by the lookaheads.
+        for cell in sorted(self.frontier):
+            risk = self.lookahead_risk(cell, risks)
+            risky_candidates.append((cell, risk))
+            if self.debug:
+                print(f"[DEBUG] Lookahead risk for candidate {self._to_pos(cell)}: {risk}")
 
         if risky_candidates:
             target, _ = min(risky_candidates, key=lambda t: t[1])
             if self.debug:
-                print(f"[DEBUG] Selected risky target {target}")
+                print(f"[DEBUG] Selected risky target {self._to_pos(target)}")
             # Attempt to move via a visited neighbor of the target.
             visited_neighbors = [n for n in self.get_neighbors(target) if n in self.visited]
             if visited_neighbors:
-                best_neighbor = min(visited_neighbors, key=lambda n: self.find_distance(n))
+                best_neighbor = min(visited_neighbors, key=distance)
                 path = self.find_visited_path(current_pos, best_neighbor)
                 if path and len(path) > 1:
                     next_cell = path[1]
                     move = self.direction_from_to(current_pos, next_cell)
                     if self.debug:
-                        print(f"[DEBUG] Risky move: heading to visited border {best_neighbor} for target {target} via {path} -> {move}")
+                        print(f"[DEBUG] Risky move: heading to visited border {self._to_pos(best_neighbor)} for target {self._to_pos(target)} via {[self._to_pos(c) for c in path]} -> {move}")
                     return move
                 elif self.debug:
                     print("[DEBUG] No path found for risky move.")
@@ -378,9 +555,9 @@ class CNFAgent(Agent):
         nbs = self.get_neighbors(current_pos)
         move = self.direction_from_to(current_pos, random.choice(nbs))
         if self.debug:
-            print(f"[DEBUG] Fallback: taking random move from {current_pos} -> {move}")
+            print(f"[DEBUG] Fallback: taking random move from {self._to_pos(current_pos)} -> {move}")
         return move
 
 class RandomWalkAgent(Agent):
     def choose_action(self):
-        return random.choice(['up', 'down', 'left', 'right'])
+        return _DIRS[random.getrandbits(2)]
@@ -1,45 +1,9 @@
 import pygame
 import sys
-from wumpus_world import WumpusWorld
+from wumpus_world import WumpusWorld, get_new_position
+from render import draw_board, draw_world, draw_ui_panel
 from agents import MLAgent
 
-def draw_world(screen, world, tile_size):
-    for i in range(world.size):
-        for j in range(world.size):
-            rect = pygame.Rect(j * tile_size, i * tile_size, tile_size, tile_size)
-            pygame.draw.rect(screen, (0, 0, 0), rect, 1)
-            cell = world.grid[i][j]
-            center = (j * tile_size + tile_size // 2, i * tile_size + tile_size // 2)
-            if cell['pit']:
-                pygame.draw.circle(screen, (50, 50, 50), center, tile_size // 4)
-            if cell['wumpus']:
-                pygame.draw.circle(screen, (255, 0, 0), center, tile_size // 4)
-            if cell['gold']:
-                pygame.draw.circle(screen, (255, 215, 0), center, tile_size // 4)
-    agent_x, agent_y = world.agent_pos
-    agent_center = (agent_y * tile_size + tile_size // 2, agent_x * tile_size + tile_size // 2)
-    pygame.draw.circle(screen, (0, 0, 255), agent_center, tile_size // 4)
-
-def draw_ui_panel(screen, move_logs, panel_rect, font):
-    pygame.draw.rect(screen, (200, 200, 200), panel_rect)
-    log_start_y = panel_rect.top + 10
-    logs_to_display = move_logs[-8:]
-    for idx, log in enumerate(logs_to_display):
-        text_surface = font.render(log, True, (0, 0, 0))
-        screen.blit(text_surface, (panel_rect.left + 10, log_start_y + idx * 25))
-
-def get_new_position(pos, direction):
-    x, y = pos
-    if direction == 'up':
-        return (x - 1, y)
-    elif direction == 'down':
-        return (x + 1, y)
-    elif direction == 'left':
-        return (x, y - 1)
-    elif direction == 'right':
-        return (x, y + 1)
-    return pos
-
 def simulate_ml(tile_size=50, fps=2, max_steps=50):
     world = WumpusWorld(size=8, num_pits=3)
     agent = MLAgent(world)
@@ -52,6 +16,7 @@ def simulate_ml(tile_size=50, fps=2, max_steps=50):
     pygame.display.set_caption("ML-based Simulation")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("Arial", 20)
+    board = draw_board(world, tile_size)
     ui_panel_rect = pygame.Rect(0, game_area_height, screen_width, ui_panel_height)
     move_logs = []
     step = 0
@@ -84,8 +49,7 @@ def simulate_ml(tile_size=50, fps=2, max_steps=50):
             reward = 100
         agent.update_q_table(current_pos, action, reward, new_pos)
         step += 1
-        screen.fill((255, 255, 255))
-        draw_world(screen, world, tile_size)
+        draw_world(screen, world, board, tile_size)
         draw_ui_panel(screen, move_logs, ui_panel_rect, font)
         pygame.display.flip()
         clock.tick(fps)
@@ -94,8 +58,7 @@ def simulate_ml(tile_size=50, fps=2, max_steps=50):
         move_logs.append("Game Over: Agent died!")
     elif world.gold_found:
         move_logs.append("Agent found the gold!")
-    screen.fill((255, 255, 255))
-    draw_world(screen, world, tile_size)
+    draw_world(screen, world, board, tile_size)
     draw_ui_panel(screen, move_logs, ui_panel_rect, font)
     pygame.display.flip()
 
@@ -3,54 +3,10 @@ import pickle
 import os
 import random
 import sys
-from wumpus_world import WumpusWorld
+from concurrent.futures import ProcessPoolExecutor
+from wumpus_world import WumpusWorld, get_new_position
 from agents import CNFAgent
 
-# If display is enabled, we import and use pygame.
-try:
-    import pygame
-except ImportError:
-    pygame = None
-
-def get_new_position(pos, direction):
-    x, y = pos
-    if direction == 'up':
-        return (x - 1, y)
-    elif direction == 'down':
-        return (x + 1, y)
-    elif direction == 'left':
-        return (x, y - 1)
-    elif direction == 'right':
-        return (x, y + 1)
-    return pos
-
-# These drawing functions are used only if display is enabled.
-def draw_world(screen, world, tile_size):
-    for i in range(world.size):
-        for j in range(world.size):
-            rect = pygame.Rect(j * tile_size, i * tile_size, tile_size, tile_size)
-            pygame.draw.rect(screen, (0, 0, 0), rect, 1)
-            cell = world.grid[i][j]
-            center = (j * tile_size + tile_size // 2, i * tile_size + tile_size // 2)
-            if cell['pit']:
-                pygame.draw.circle(screen, (50, 50, 50), center, tile_size // 4)
-            if cell['wumpus']:
-                pygame.draw.circle(screen, (255, 0, 0), center, tile_size // 4)
-            if cell['gold']:
-                pygame.draw.circle(screen, (255, 215, 0), center, tile_size // 4)
-    # Draw agent.
-    agent_x, agent_y = world.agent_pos
-    agent_center = (agent_y * tile_size + tile_size // 2, agent_x * tile_size + tile_size // 2)
-    pygame.draw.circle(screen, (0, 0, 255), agent_center, tile_size // 4)
-
-def draw_ui_panel(screen, move_logs, panel_rect, font):
-    pygame.draw.rect(screen, (200, 200, 200), panel_rect)
-    log_start_y = panel_rect.top + 10
-    logs_to_display = move_logs[-8:]
-    for idx, log in enumerate(logs_to_display):
-        text_surface = font.render(log, True, (0, 0, 0))
-        screen.blit(text_surface, (panel_rect.left + 10, log_start_y + idx * 25))
-
 def run_game(tile_size=50, fps=2, max_steps=200, debug=False, load_file=None, display=True):
     # If load_file is provided, load the world from that file; otherwise, generate a new one.
     if load_file:
@@ -60,7 +16,17 @@ def run_game(tile_size=50, fps=2, max_steps=200, debug=False, load_file=None, di
     else:
         world = WumpusWorld(size=8, num_pits=3)
     agent = CNFAgent(world, debug=debug)
-    
+
+    # If display is enabled, we import and use pygame. Headless runs, including
+    # every play_games worker, never import it.
+    pygame = None
+    if display:
+        try:
+            import pygame
+            from render import draw_board, draw_world, draw_ui_panel
+        except ImportError:
+            pygame = None
+
     if display and pygame:
         pygame.init()
         ui_panel_height = 200
@@ -71,6 +37,8 @@ def run_game(tile_size=50, fps=2, max_steps=200, debug=False, load_file=None, di
         pygame.display.set_caption("CNF-based Simulation")
         clock = pygame.time.Clock()
         font = pygame.font.SysFont("Arial", 20)
+        board = draw_board(world, tile_size)
+        ui_panel_rect = pygame.Rect(0, game_area_height, screen_width, ui_panel_height)
     else:
         if debug:
             print("[DEBUG] Running in headless mode (no display).")
@@ -104,9 +72,8 @@ def run_game(tile_size=50, fps=2, max_steps=200, debug=False, load_file=None, di
         move_logs.append(f"Step {step}: {action} | New Pos: {current_pos} | {outcome} | Percepts: {percepts}")
         step += 1
         if display and pygame:
-            screen.fill((255, 255, 255))
-            draw_world(screen, world, tile_size)
-            draw_ui_panel(screen, move_logs, pygame.Rect(0, game_area_height, screen_width, ui_panel_height), font)
+            draw_world(screen, world, board, tile_size)
+            draw_ui_panel(screen, move_logs, ui_panel_rect, font)
             pygame.display.flip()
             clock.tick(fps)
         # else:
@@ -118,18 +85,41 @@ def run_game(tile_size=50, fps=2, max_steps=200, debug=False, load_file=None, di
         move_logs.append("Agent found the gold!")
     
     if display and pygame:
-        screen.fill((255, 255, 255))
-        draw_world(screen, world, tile_size)
-        draw_ui_panel(screen, move_logs, pygame.Rect(0, game_area_height, screen_width, ui_panel_height), font)
+        draw_world(screen, world, board, tile_size)
+        draw_ui_panel(screen, move_logs, ui_panel_rect, font)
         pygame.display.flip()
     return world, move_logs
 
-def run_games(num_games, save_failures, load_file, debug, display):
+def run_headless_game(job):
+    # Worker for play_games: one game without a display. Every game gets its own
+    # seed, since forked workers would otherwise share the parent's random state.
+    seed, debug, load_file = job
+    random.seed(seed)
+    return run_game(debug=debug, load_file=load_file, display=False)[0]
+
+def play_games(num_games, load_file, debug, display, seed):
+    # Yields the final world of each game, in game order. Game i is seeded with
+    # seed + i, so any run, or any single game from it, can be repeated.
+    if display:
+        for game_index in range(num_games):
+            random.seed(seed + game_index)
+            yield run_game(debug=debug, load_file=load_file, display=display)[0]
+        return
+    # Headless games are independent, so spread them over every core.
+    workers = os.cpu_count() or 1
+    jobs = [(seed + game_index, debug, load_file) for game_index in range(num_games)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run_headless_game, jobs,
+                                chunksize=max(1, num_games // (4 * workers)))
+
+def run_games(num_games, save_failures, load_file, debug, display, seed=None):
+    # Without a seed every run samples new worlds; the base seed it draws is
+    # printed, so the run can still be repeated with --seed.
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
     failures = 0
-    game_index = 0
-    while game_index < num_games:
+    for game_index, world in enumerate(play_games(num_games, load_file, debug, display, seed)):
         # print(f"Running game {game_index}")
-        world, logs = run_game(debug=debug, load_file=load_file, display=display)
         if not world.agent_alive:
             failures += 1
             if save_failures:
@@ -139,8 +129,7 @@ def run_games(num_games, save_failures, load_file, debug, display):
                 with open(filename, 'wb') as f:
                     pickle.dump(world, f)
                 # print(f"Game {game_index} failed. Saved world to {filename}")
-        game_index += 1
-    print(f"Total games: {num_games}, Failures: {failures}")
+    print(f"Total games: {num_games}, Failures: {failures}, Seed: {seed}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run multiple CNF Agent games and save failures.")
@@ -149,6 +138,7 @@ if __name__ == "__main__":
     parser.add_argument("--load", type=str, help="Load a specific world file instead of generating a new one")
     parser.add_argument("--debug", action="store_true", help="Enable debug output")
     parser.add_argument("--display", action="store_true", help="Enable Pygame display")
+    parser.add_argument("--seed", type=int, default=None, help="Base random seed; game i is seeded with seed + i (random if omitted)")
     args = parser.parse_args()
 
-    run_games(args.num_games, args.save_failures, args.load, args.debug, args.display)
+    run_games(args.num_games, args.save_failures, args.load, args.debug, args.display, args.seed)
@@ -1,48 +1,47 @@
-import pygame
+import argparse
 import sys
-from wumpus_world import WumpusWorld
+from wumpus_world import WumpusWorld, get_new_position
 from agents import RandomWalkAgent
 
-def draw_world(screen, world, tile_size):
-    for i in range(world.size):
-        for j in range(world.size):
-            rect = pygame.Rect(j * tile_size, i * tile_size, tile_size, tile_size)
-            pygame.draw.rect(screen, (0, 0, 0), rect, 1)
-            cell = world.grid[i][j]
-            center = (j * tile_size + tile_size // 2, i * tile_size + tile_size // 2)
-            if cell['pit']:
-                pygame.draw.circle(screen, (50, 50, 50), center, tile_size // 4)
-            if cell['wumpus']:
-                pygame.draw.circle(screen, (255, 0, 0), center, tile_size // 4)
-            if cell['gold']:
-                pygame.draw.circle(screen, (255, 215, 0), center, tile_size // 4)
-    agent_x, agent_y = world.agent_pos
-    agent_center = (agent_y * tile_size + tile_size // 2, agent_x * tile_size + tile_size // 2)
-    pygame.draw.circle(screen, (0, 0, 255), agent_center, tile_size // 4)
+def take_random_step(world, agent, step):
+    """Move the agent one random step and return the log line for it."""
+    current_pos = world.agent_pos
+    percepts = world.get_percepts(current_pos)
+    action = agent.choose_action()
+    world.move_agent(get_new_position(current_pos, action))
+    new_pos = world.agent_pos
+    if not world.agent_alive:
+        outcome = "Agent died!"
+    elif world.gold_found:
+        outcome = "Gold found! Agent wins!"
+    else:
+        outcome = "Moved"
+    return f"Step {step}: {action} | New Pos: {new_pos} | {outcome} | Percepts: {percepts}"
 
-def draw_ui_panel(screen, move_logs, panel_rect, font):
-    pygame.draw.rect(screen, (200, 200, 200), panel_rect)
-    log_start_y = panel_rect.top + 10
-    logs_to_display = move_logs[-8:]
-    for idx, log in enumerate(logs_to_display):
-        text_surface = font.render(log, True, (0, 0, 0))
-        screen.blit(text_surface, (panel_rect.left + 10, log_start_y + idx * 25))
+def log_game_over(world, move_logs):
+    if not world.agent_alive:
+        move_logs.append("Game Over: Agent died!")
+    elif world.gold_found:
+        move_logs.append("Agent found the gold!")
 
-def get_new_position(pos, direction):
-    x, y = pos
-    if direction == 'up':
-        return (x - 1, y)
-    elif direction == 'down':
-        return (x + 1, y)
-    elif direction == 'left':
-        return (x, y - 1)
-    elif direction == 'right':
-        return (x, y + 1)
-    return pos
+def run_random(world, agent, max_steps):
+    """Play a random walk to the end without any display and return its move logs."""
+    move_logs = []
+    step = 0
+    while step < max_steps and world.agent_alive and not world.gold_found:
+        move_logs.append(take_random_step(world, agent, step))
+        step += 1
+    log_game_over(world, move_logs)
+    return move_logs
 
-def simulate_random(tile_size=50, fps=2, max_steps=50):
+def simulate_random(tile_size=50, fps=2, max_steps=50, headless=False):
     world = WumpusWorld(size=8, num_pits=3)
     agent = RandomWalkAgent(world)
+    if headless:
+        return run_random(world, agent, max_steps)
+    # Only the display needs pygame, so headless runs work without it installed.
+    import pygame
+    from render import draw_board, draw_world, draw_ui_panel
     pygame.init()
     ui_panel_height = 200
     game_area_height = world.size * tile_size
@@ -52,10 +51,12 @@ def simulate_random(tile_size=50, fps=2, max_steps=50):
     pygame.display.set_caption("Random Walk Simulation")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont("Arial", 20)
+    board = draw_board(world, tile_size)
     ui_panel_rect = pygame.Rect(0, game_area_height, screen_width, ui_panel_height)
     move_logs = []
     step = 0
     running = True
+    prev_pos = None  # Where the agent was last drawn; None repaints the whole board.
 
     while running and step < max_steps and world.agent_alive and not world.gold_found:
         for event in pygame.event.get():
@@ -63,32 +64,16 @@ def simulate_random(tile_size=50, fps=2, max_steps=50):
                 running = False
                 pygame.quit()
                 sys.exit()
-        current_pos = world.agent_pos
-        percepts = world.get_percepts(current_pos)
-        action = agent.choose_action()
-        world.move_agent(get_new_position(current_pos, action))
-        new_pos = world.agent_pos
-        if not world.agent_alive:
-            outcome = "Agent died!"
-        elif world.gold_found:
-            outcome = "Gold found! Agent wins!"
-        else:
-            outcome = "Moved"
-        log_entry = f"Step {step}: {action} | New Pos: {new_pos} | {outcome} | Percepts: {percepts}"
-        move_logs.append(log_entry)
+        move_logs.append(take_random_step(world, agent, step))
         step += 1
-        screen.fill((255, 255, 255))
-        draw_world(screen, world, tile_size)
+        dirty = draw_world(screen, world, board, tile_size, prev_pos)
         draw_ui_panel(screen, move_logs, ui_panel_rect, font)
-        pygame.display.flip()
+        pygame.display.update(dirty + [ui_panel_rect])
+        prev_pos = world.agent_pos
         clock.tick(fps)
 
-    if not world.agent_alive:
-        move_logs.append("Game Over: Agent died!")
-    elif world.gold_found:
-        move_logs.append("Agent found the gold!")
-    screen.fill((255, 255, 255))
-    draw_world(screen, world, tile_size)
+    log_game_over(world, move_logs)
+    draw_world(screen, world, board, tile_size)
     draw_ui_panel(screen, move_logs, ui_panel_rect, font)
     pygame.display.flip()
 
@@ -101,4 +86,10 @@ def simulate_random(tile_size=50, fps=2, max_steps=50):
                 sys.exit()
 
 if __name__ == "__main__":
-    simulate_random()
+    parser = argparse.ArgumentParser(description="Run a random walk Wumpus World Simulation")
+    parser.add_argument("--headless", action="store_true", help="Run without a display and print the move log")
+    args = parser.parse_args()
+
+    move_logs = simulate_random(headless=args.headless)
+    if args.headless:
+        print("\n".join(move_logs))
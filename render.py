@@ -0,0 +1,52 @@
+# render.py
+
+import pygame
+from functools import lru_cache
+
+def draw_board(world, tile_size):
+    # Pits, the Wumpus and the gold never move once the world is generated, so
+    # the board is drawn once onto its own surface and blitted every frame.
+    board = pygame.Surface((world.size * tile_size, world.size * tile_size))
+    board.fill((255, 255, 255))
+    for i in range(world.size):
+        for j in range(world.size):
+            rect = pygame.Rect(j * tile_size, i * tile_size, tile_size, tile_size)
+            pygame.draw.rect(board, (0, 0, 0), rect, 1)
+            cell = world.grid[i][j]
+            center = (j * tile_size + tile_size // 2, i * tile_size + tile_size // 2)
+            if cell['pit']:
+                pygame.draw.circle(board, (50, 50, 50), center, tile_size // 4)
+            if cell['wumpus']:
+                pygame.draw.circle(board, (255, 0, 0), center, tile_size // 4)
+            if cell['gold']:
+                pygame.draw.circle(board, (255, 215, 0), center, tile_size // 4)
+    return board.convert()
+
+def draw_world(screen, world, board, tile_size, prev_pos=None):
+    # Given where the agent was last drawn, only its old and new tiles are
+    # repainted. Returns the rectangles of the screen that changed.
+    if prev_pos is None:
+        screen.blit(board, (0, 0))
+        dirty = [board.get_rect()]
+    else:
+        dirty = [pygame.Rect(pos[1] * tile_size, pos[0] * tile_size, tile_size, tile_size)
+                 for pos in (prev_pos, world.agent_pos)]
+        for rect in dirty:
+            screen.blit(board, rect, rect)
+    agent_x, agent_y = world.agent_pos
+    agent_center = (agent_y * tile_size + tile_size // 2, agent_x * tile_size + tile_size // 2)
+    pygame.draw.circle(screen, (0, 0, 255), agent_center, tile_size // 4)
+    return dirty
+
+@lru_cache(maxsize=64)
+def render_log_line(font, log):
+    # Each log line stays on the panel for several frames; render it only once.
+    return font.render(log, True, (0, 0, 0))
+
+def draw_ui_panel(screen, move_logs, panel_rect, font):
+    pygame.draw.rect(screen, (200, 200, 200), panel_rect)
+    log_start_y = panel_rect.top + 10
+    logs_to_display = move_logs[-8:]
+    for idx, log in enumerate(logs_to_display):
+        text_surface = render_log_line(font, log)
+        screen.blit(text_surface, (panel_rect.left + 10, log_start_y + idx * 25))
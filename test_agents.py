@@ -0,0 +1,126 @@
+import hashlib
+import random
+
+import pytest
+
+import agents
+import agentsTakesTooLong
+from wumpus_world import WumpusWorld, get_new_position
+
+
+def move_trace(agent_cls, size, num_games, max_steps=200):
+    # md5 of every move made in num_games seeded games.
+    digest = hashlib.md5()
+    for seed in range(num_games):
+        random.seed(seed)
+        world = WumpusWorld(size=size, num_pits=3)
+        agent = agent_cls(world)
+        moves = []
+        for _ in range(max_steps):
+            if not world.agent_alive or world.gold_found:
+                break
+            action = agent.choose_action()
+            moves.append(action)
+            world.move_agent(get_new_position(world.agent_pos, action))
+        digest.update((",".join(moves) + "|").encode())
+    return digest.hexdigest()
+
+
+def open_world(gold):
+    # A 4x4 world with no pits, the Wumpus in the far corner and the gold at gold.
+    random.seed(0)
+    world = WumpusWorld(size=4, num_pits=3)
+    for row in world.grid:
+        for cell in row:
+            cell.update(pit=False, wumpus=False, gold=False)
+    world.wumpus_pos = (3, 3)
+    world.gold_pos = gold
+    world.grid[3][3]['wumpus'] = True
+    world.grid[gold[0]][gold[1]]['gold'] = True
+    return world
+
+
+def visit(agent, world, cells):
+    # Walk the agent through cells, letting it decide (and learn) at each one.
+    # Returns the move it chooses at the last cell.
+    for pos in cells:
+        world.agent_pos = pos
+        action = agent.choose_action()
+    return action
+
+
+# Move traces on seeded worlds. These are regression pins only: they were
+# recorded from the code and catch any later change to a move, but do not
+# by themselves show that earlier changes kept the original behaviour.
+@pytest.mark.parametrize("size, num_games, expected", [
+    # Same moves as the original tuple-based agent.
+    (4, 100, 'b85059c7e8d8c4b739ae180e02fd4106'),
+    # Differs from the original agent only in tie-breaks between equally
+    # short routes, from planning every safe move with a single BFS.
+    (8, 50, 'cdb6bafe917f0ce0fcfccb1a0070e45b'),
+])
+def test_cnf_agent_move_trace(size, num_games, expected):
+    assert move_trace(agents.CNFAgent, size, num_games) == expected
+
+
+# The older agent's traces include two intended behaviour changes: visited
+# paths are searched from both ends, and risky candidates come only from
+# the frontier.
+@pytest.mark.parametrize("size, num_games, expected", [
+    # Changed by both the two-ended path search and the frontier-only scan.
+    (4, 100, 'afd9e43c56336ecf28182474498eea2f'),
+    # Changed by the two-ended path search only.
+    (8, 50, 'e3775bf45ff11d5b7d71bf851827dfeb'),
+])
+def test_older_cnf_agent_move_trace(size, num_games, expected):
+    assert move_trace(agentsTakesTooLong.CNFAgent, size, num_games) == expected
+
+
+def test_cnf_agent_cell_ids():
+    random.seed(0)
+    agent = agents.CNFAgent(WumpusWorld(size=4, num_pits=3))
+    assert agent.start == 0
+    for idx in range(agent.offset):
+        assert agent._to_idx(agent._to_pos(idx)) == idx
+
+
+def test_cnf_agent_takes_safe_path_to_cell_zero(monkeypatch):
+    # From (0, 1), cell (0, 0) -- id 0 -- is the only proven-safe cell at
+    # distance 1, so the safe branch must pick it without the risky fallback.
+    world = open_world(gold=(2, 3))
+    agent = agents.CNFAgent(world)
+    visit(agent, world, [(0, 2), (1, 1)])
+
+    def no_risky_fallback(current_pos):
+        raise AssertionError("safe target at cell 0 was skipped")
+    monkeypatch.setattr(agent, 'find_safe_paths_to_risky', no_risky_fallback)
+    assert visit(agent, world, [(0, 1)]) == 'left'
+    assert agent.current_target == 0
+
+
+def test_older_cnf_agent_returns_home_to_cell_zero():
+    # Perceiving the gold sets the goal to the start cell, id 0; the agent must
+    # then head back along visited cells rather than keep exploring.
+    world = open_world(gold=(0, 2))
+    agent = agentsTakesTooLong.CNFAgent(world)
+    assert agent.start == 0
+    assert visit(agent, world, [(0, 0), (1, 0), (1, 1), (1, 2), (0, 2)]) == 'down'
+    assert agent.goal == 0
+
+
+def test_bfs_parents_to_blocked_matches_single_target_searches():
+    rng = random.Random(0)
+    size = 6
+    random.seed(0)
+    agent = agents.CNFAgent(WumpusWorld(size=size, num_pits=3))
+    neighbors = agent.neighbors
+    for _ in range(200):
+        passable = bytearray(rng.random() < 0.6 for _ in range(size * size))
+        start = rng.randrange(size * size)
+        parents = agents.bfs_parents_to_blocked(neighbors, passable, start)
+        for target in range(size * size):
+            single = agents.bfs_parents(neighbors, passable, start, target)
+            assert (parents[target] == -1) == (single[target] == -1)
+            if single[target] != -1:
+                assert agent.path_from_parents(parents, target) == \
+                    agent.path_from_parents(single, target)
@@ -0,0 +1,71 @@
+import hashlib
+import random
+from collections import deque
+
+from wumpus_world import WumpusWorld, get_new_position
+
+
+def reference_is_winnable(world):
+    # Plain BFS from the start to the gold, avoiding pits and the Wumpus.
+    seen = {world.agent_pos}
+    queue = deque([world.agent_pos])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == world.gold_pos:
+            return True
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if not (0 <= nx < world.size and 0 <= ny < world.size) or (nx, ny) in seen:
+                continue
+            cell = world.grid[nx][ny]
+            if not cell['pit'] and not cell['wumpus']:
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return False
+
+
+def test_get_new_position():
+    assert get_new_position((2, 2), 'up') == (1, 2)
+    assert get_new_position((2, 2), 'down') == (3, 2)
+    assert get_new_position((2, 2), 'left') == (2, 1)
+    assert get_new_position((2, 2), 'right') == (2, 3)
+    assert get_new_position((2, 2), 'stay') == (2, 2)
+
+
+def test_move_agent_rejects_moves_off_the_grid():
+    random.seed(0)
+    world = WumpusWorld(size=4, num_pits=3)
+    for pos in [(-1, 0), (4, 0), (0, -1), (0, 4)]:
+        assert not world.move_agent(pos)
+        assert world.agent_pos == (3, 0)
+
+
+def test_generated_worlds_are_reproducible():
+    # Pins the layouts of seeded worlds, so changes to world generation
+    # must keep consuming the random stream exactly as before.
+    digest = hashlib.md5()
+    for seed in range(200):
+        random.seed(seed)
+        world = WumpusWorld(size=8, num_pits=3)
+        pits = sorted((i, j) for i in range(world.size) for j in range(world.size)
+                      if world.grid[i][j]['pit'])
+        digest.update(repr((pits, world.wumpus_pos, world.gold_pos)).encode())
+    # Layouts of seeds 0..199 on an 8x8 board with 3 pits, as the original
+    # world generation produced them.
+    assert digest.hexdigest() == '011684382e07d58d5d1232c5590559fa'
+
+
+def test_is_winnable_matches_reference_bfs():
+    rng = random.Random(1)
+    results = set()
+    for seed in range(300):
+        random.seed(seed)
+        world = WumpusWorld(size=6, num_pits=3)
+        # Extra pits make some worlds unwinnable.
+        for _ in range(rng.randrange(8)):
+            i, j = rng.randrange(world.size), rng.randrange(world.size)
+            if (i, j) not in (world.agent_pos, world.gold_pos):
+                world.grid[i][j]['pit'] = True
+        expected = reference_is_winnable(world)
+        assert world._is_winnable() == expected
+        results.add(expected)
+    assert results == {True, False}
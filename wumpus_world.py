@@ -1,6 +1,14 @@
 # wumpus_world.py
 
 import random
+from collections import deque
+
+# Row/column step for each move; anything else leaves the position unchanged.
+_DELTA = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+
+def get_new_position(pos, direction):
+    dx, dy = _DELTA.get(direction, (0, 0))
+    return (pos[0] + dx, pos[1] + dy)
 
 class WumpusWorld:
     def __init__(self, size=8, num_pits=3):
@@ -24,7 +32,8 @@ class WumpusWorld:
             for pos in pit_positions:
                 self.grid[pos[0]][pos[1]]['pit'] = True
             # Choose Wumpus position from positions that are not pits.
-            remaining = [pos for pos in positions if pos not in pit_positions]
+            pit_set = set(pit_positions)
+            remaining = [pos for pos in positions if pos not in pit_set]
             self.wumpus_pos = random.choice(remaining)
             self.grid[self.wumpus_pos[0]][self.wumpus_pos[1]]['wumpus'] = True
             # Choose gold position from remaining positions (neither pit nor Wumpus).
@@ -44,18 +53,17 @@ class WumpusWorld:
         """
         start = self.agent_pos
         target = self.gold_pos
-        visited = set()
-        queue = [start]
+        # Cells are marked when queued, so each one enters the queue at most once.
+        visited = {start}
+        queue = deque([start])
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current == target:
                 return True
-            if current in visited:
-                continue
-            visited.add(current)
             for neighbor in self.get_adjacent_positions(current):
                 # Only add safe cells (no pit and no Wumpus) to the queue.
-                if not self.grid[neighbor[0]][neighbor[1]]['pit'] and not self.grid[neighbor[0]][neighbor[1]]['wumpus']:
+                if neighbor not in visited and not self.grid[neighbor[0]][neighbor[1]]['pit'] and not self.grid[neighbor[0]][neighbor[1]]['wumpus']:
+                    visited.add(neighbor)
                     queue.append(neighbor)
         return False
 
@@ -84,11 +92,12 @@ class WumpusWorld:
         return percepts
 
     def move_agent(self, new_pos):
-        if (new_pos[0] < 0 or new_pos[0] >= self.size or 
-            new_pos[1] < 0 or new_pos[1] >= self.size):
+        x, y = new_pos
+        size = self.size
+        if not (0 <= x < size and 0 <= y < size):
             return False  # Illegal move.
         self.agent_pos = new_pos
-        cell = self.grid[new_pos[0]][new_pos[1]]
+        cell = self.grid[x][y]
         if cell['pit'] or cell['wumpus']:
             self.agent_alive = False
         if cell['gold']: